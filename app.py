@@ -11,24 +11,30 @@ Then open http://localhost:7860 in your browser
 """
 from __future__ import annotations
 
+import functools
 import gradio as gr
+import heapq
 import re
+from collections import defaultdict
+from concurrent.futures import ThreadPoolExecutor
 from jellyfin_client import JellyfinClient
 from spotify_client import SpotifyClient
 from ssh_client import SSHClient
 from duplicate_finder import DuplicateFinder, DuplicateGroup
+import hashlib
 import random
-from typing import Any
-from rapidfuzz import fuzz
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Callable, Iterator
+from urllib.parse import urlsplit
+import numpy as np
+from rapidfuzz import fuzz, process
 
 jellyfin_client: JellyfinClient | None = None
 spotify_client: SpotifyClient | None = None
 ssh_client_instance: SSHClient | None = None
 
-duplicate_groups: list[DuplicateGroup] = []
-current_group_index: int = 0
-pending_playlist: dict = {}
-
 # --- Cleanup feature state ---
 bogus_playlists: list[dict] = []
 junk_artist_candidates: list[dict] = []
@@ -36,6 +42,78 @@ artist_duplicate_pairs: list[tuple[dict, dict]] = []
 missing_artwork_items: list[dict] = []
 m3u_scan_results: list[str] = []
 
+# --- Library fetch cache ---
+# Every cleanup scan re-pulls the whole library from Jellyfin, and those
+# fetches dominate scan latency. Cache them in-process with per-endpoint
+# TTLs — playlists churn faster than artists/albums, so they expire sooner.
+_FETCH_TTL = {"artists_raw": 600, "albums_raw": 600, "playlists": 120}
+_fetch_cache: dict[str, tuple[float, Any]] = {}
+
+
+def _cached_fetch(key: str, fetch: Callable[[], Any]) -> Any:
+    """Return the cached result for `key` if still fresh, else fetch anew."""
+    entry = _fetch_cache.get(key)
+    if entry is not None and time.monotonic() - entry[0] < _FETCH_TTL.get(key, 300):
+        return entry[1]
+    value = fetch()
+    _fetch_cache[key] = (time.monotonic(), value)
+    return value
+
+
+def refresh_library_cache() -> str:
+    _invalidate_library_caches()
+    return "✅ Library cache cleared — the next scan fetches fresh data from Jellyfin"
+
+
+def _invalidate_library_caches() -> None:
+    """Drop cached library data after a mutation so scans never show
+    deleted or renamed items for the rest of the TTL window."""
+    global _da_score_cache
+    _fetch_cache.clear()
+    _da_score_cache = None
+
+
+# Checkbox lists are streamed to the browser in growing slices of this
+# size, so a huge scan result renders progressively instead of arriving
+# as one monolithic JSON payload.
+_CHOICE_BATCH = 200
+
+# Shared fallback for `.get(...) or _EMPTY` chains on full-library passes —
+# a `or {}` literal would allocate a fresh dict for every item missing the key.
+_EMPTY: dict = {}
+
+
+def _choice_batches(items: list) -> Iterator[list]:
+    """Yield successively longer prefixes of items, one batch step at a time.
+
+    The final full list is NOT yielded — callers emit it themselves with
+    their finished status line.
+    """
+    for end in range(_CHOICE_BATCH, len(items), _CHOICE_BATCH):
+        yield items[:end]
+
+
+@dataclass(slots=True)
+class LibrarySnapshot:
+    """One view of the library shared by all cleanup scans."""
+    artists: list[dict]
+    albums: list[dict]
+    playlists: list[dict]
+
+
+def _get_snapshot() -> LibrarySnapshot:
+    """Fetch artists, albums, and playlists through the TTL cache.
+
+    Whichever endpoints are stale are fetched concurrently, so a cold
+    snapshot costs one round-trip's wall time instead of three, and every
+    other tab's scan within the TTL window is served from memory.
+    """
+    with ThreadPoolExecutor(max_workers=3) as ex:
+        artists = ex.submit(_cached_fetch, "artists_raw", jellyfin_client.get_all_artists_raw)
+        albums = ex.submit(_cached_fetch, "albums_raw", jellyfin_client.get_all_albums_raw)
+        playlists = ex.submit(_cached_fetch, "playlists", jellyfin_client.get_all_playlists)
+        return LibrarySnapshot(artists.result(), albums.result(), playlists.result())
+
 
 def connect_jellyfin(url: str, api_key: str, user_id: str) -> str:
     global jellyfin_client
@@ -45,6 +123,7 @@ def connect_jellyfin(url: str, api_key: str, user_id: str) -> str:
 
     try:
         jellyfin_client = JellyfinClient(url.strip(), api_key.strip(), user_id.strip() or None)
+        _fetch_cache.clear()  # cached library data may belong to another server
         artists = jellyfin_client.get_all_artists()
         return f"✅ Connected to Jellyfin. Found {len(artists)} artists."
     except Exception as e:
@@ -66,80 +145,109 @@ def connect_spotify(client_id: str, client_secret: str) -> str:
         return f"❌ Spotify connection failed: {e}"
 
 
-def scan_duplicates(threshold: int) -> tuple[str, str, Any, Any]:
-    global duplicate_groups, current_group_index
+def scan_duplicates(threshold: int):
+    """Generator handler: yields progress updates so the UI stays live
+    while the artist fetch and the N^2 fuzzy scoring run.
 
+    One handler drives every affected component (status, group display,
+    preferred name, nav/apply buttons, session state) in a single round
+    trip per update instead of separate click registrations."""
+    hidden = (*[gr.update(visible=False)] * 5, [], [], 0)
     if not jellyfin_client:
-        return "❌ Connect to Jellyfin first", "", gr.update(visible=False), gr.update(visible=False)
+        yield ("❌ Connect to Jellyfin first", "", *hidden)
+        return
 
     try:
+        yield ("⏳ Fetching artists from Jellyfin…", "", *hidden)
+        artists = jellyfin_client.get_all_artists(refresh=True)
+
+        yield (f"⏳ Scoring {len(artists)} artists for duplicates…", "", *hidden)
         finder = DuplicateFinder(threshold=threshold)
-        duplicate_groups = finder.find_duplicates(jellyfin_client.get_all_artists(refresh=True))
-        current_group_index = 0
+        duplicate_groups = finder.find_duplicates(artists)
+
         if not duplicate_groups:
-            return "✅ No duplicates found", "", gr.update(visible=False), gr.update(visible=False)
-        return (
+            yield ("✅ No duplicates found", "", *hidden)
+            return
+        # Render every group's Markdown once here so Next/Previous clicks
+        # are pure O(1) indexing instead of re-formatting on each press.
+        displays = [_render_group(g, i, len(duplicate_groups)) for i, g in enumerate(duplicate_groups)]
+        yield (
             f"🔍 Found {len(duplicate_groups)} potential duplicate groups. Click Next to review.",
             "",
-            gr.update(visible=True),
-            gr.update(visible=True),
+            *[gr.update(visible=True)] * 5,
+            duplicate_groups,
+            displays,
+            0,
         )
     except Exception as e:
-        duplicate_groups = []
-        return f"❌ Scan failed: {e}", "", gr.update(visible=False), gr.update(visible=False)
+        yield (f"❌ Scan failed: {e}", "", *hidden)
+
+
+def _render_group(group: DuplicateGroup, index: int, total: int) -> str:
+    parts = [
+        f"## Group {index + 1} of {total}",
+        "",
+        f"**Suggested name:** `{group.canonical_name}`",
+        "",
+        "### Artists in this group:",
+        "",
+    ]
+    for i, artist in enumerate(group.artists, 1):
+        parts.append(f"{i}. **{artist.title}**")
+        parts.append(f"   - Albums: {artist.album_count} | Tracks: {artist.track_count}")
+        parts.append(f"   - Item Id: `{artist.item_id}`")
+        parts.append("")
+    return "\n".join(parts)
 
 
-def _current_group_display() -> tuple[str, str]:
+def _current_group_display(duplicate_groups: list[DuplicateGroup], displays: list[str], index: int) -> tuple[str, str]:
     if not duplicate_groups:
         return "No duplicates to review", ""
-    if current_group_index >= len(duplicate_groups):
+    if index >= len(duplicate_groups):
         return "✅ All groups reviewed", ""
-
-    group = duplicate_groups[current_group_index]
-    display = f"## Group {current_group_index + 1} of {len(duplicate_groups)}\n\n"
-    display += f"**Suggested name:** `{group.canonical_name}`\n\n"
-    display += "### Artists in this group:\n\n"
-    for i, artist in enumerate(group.artists, 1):
-        display += f"{i}. **{artist.title}**\n"
-        display += f"   - Albums: {artist.album_count} | Tracks: {artist.track_count}\n"
-        display += f"   - Item Id: `{artist.item_id}`\n\n"
-    return display, group.canonical_name
+    return displays[index], duplicate_groups[index].canonical_name
 
 
-def next_group() -> tuple[str, str]:
-    global current_group_index
-    current_group_index += 1
-    return _current_group_display()
+def next_group(duplicate_groups: list[DuplicateGroup], displays: list[str], index: int) -> tuple[str, str, int]:
+    index += 1
+    return *_current_group_display(duplicate_groups, displays, index), index
 
 
-def prev_group() -> tuple[str, str]:
-    global current_group_index
-    current_group_index = max(0, current_group_index - 1)
-    return _current_group_display()
+def prev_group(duplicate_groups: list[DuplicateGroup], displays: list[str], index: int) -> tuple[str, str, int]:
+    index = max(0, index - 1)
+    return *_current_group_display(duplicate_groups, displays, index), index
 
 
-def apply_rename(preferred_name: str) -> str:
-    global duplicate_groups, current_group_index
-
+def apply_rename(preferred_name: str, duplicate_groups: list[DuplicateGroup], index: int) -> str:
     if not jellyfin_client:
         return "❌ Jellyfin not connected"
-    if not duplicate_groups or current_group_index >= len(duplicate_groups):
+    if not duplicate_groups or index >= len(duplicate_groups):
         return "❌ No group selected"
     if not preferred_name.strip():
         return "❌ Enter a preferred name"
 
-    group = duplicate_groups[current_group_index]
+    group = duplicate_groups[index]
     preferred_name = preferred_name.strip()
 
-    try:
-        renamed = 0
-        for artist in group.artists:
-            if artist.title != preferred_name:
-                jellyfin_client.rename_artist(artist.item_id, preferred_name, preferred_name)
-                renamed += 1
-        return f"✅ Renamed {renamed} artists to '{preferred_name}'"
-    except Exception as e:
-        return f"❌ Rename failed: {e}"
+    targets = [a for a in group.artists if a.title != preferred_name]
+
+    def _rename(artist) -> str | None:
+        try:
+            jellyfin_client.rename_artist(artist.item_id, preferred_name, preferred_name)
+            return None
+        except Exception as e:
+            return f"{artist.title}: {e}"
+
+    # Renames are independent HTTP calls — overlap them instead of paying
+    # one round-trip per artist in the group.
+    with ThreadPoolExecutor(max_workers=_LOOKUP_WORKERS) as ex:
+        errors = [err for err in ex.map(_rename, targets) if err]
+
+    _invalidate_library_caches()
+    msg = f"✅ Renamed {len(targets) - len(errors)} artists to '{preferred_name}'"
+    if errors:
+        msg += "\n\n❌ Errors:\n" + "\n".join(errors)
+    return msg
 
 
 # ---------------------------------------------------------------------------
@@ -162,11 +270,26 @@ def _playlist_label(p: dict) -> str:
     return "  |  ".join(parts)
 
 
-def _match_playlist_to_album(playlist_name: str, albums: list[dict]) -> str | None:
+def _build_album_index(albums: list[dict]) -> dict[str, list[tuple[str, dict]]]:
+    """Index albums by lowercased AlbumArtist: {artist: [(name_lower, album)]}."""
+    index: dict[str, list[tuple[str, dict]]] = {}
+    for album in albums:
+        artist = album.get("AlbumArtist", "").lower()
+        index.setdefault(artist, []).append((album.get("Name", "").lower(), album))
+    return index
+
+
+def _match_playlist_to_album(
+    playlist_name: str, albums_by_artist: dict[str, list[tuple[str, dict]]]
+) -> str | None:
     """
     Try to find an album in Jellyfin that corresponds to a playlist name.
     Playlist names are typically "Artist - Album Title".
     Returns a display string "Album Title (by Artist)" if matched, else None.
+
+    Scans only albums under fuzzily-matching artists instead of the whole
+    album list, with the fuzzy scoring done in C via rapidfuzz.process —
+    per-playlist cost drops from O(albums) to a handful of artist buckets.
     """
     if " - " not in playlist_name:
         return None
@@ -174,23 +297,34 @@ def _match_playlist_to_album(playlist_name: str, albums: list[dict]) -> str | No
     artist_part, album_part = playlist_name.split(" - ", 1)
     artist_norm = artist_part.strip().lower()
     album_norm = album_part.strip().lower()
-    for album in albums:
-        a_name = album.get("Name", "").lower()
-        a_artist = album.get("AlbumArtist", "").lower()
-        name_score = fuzz.token_sort_ratio(a_name, album_norm)
-        artist_score = fuzz.token_sort_ratio(a_artist, artist_norm)
-        if name_score >= 85 and artist_score >= 75:
+    candidates = process.extract(
+        artist_norm, list(albums_by_artist), scorer=fuzz.token_sort_ratio,
+        score_cutoff=75, limit=5,
+    )
+    for artist_key, _, _ in candidates:
+        names = [name for name, _ in albums_by_artist[artist_key]]
+        best = process.extractOne(
+            album_norm, names, scorer=fuzz.token_sort_ratio, score_cutoff=85,
+        )
+        if best:
+            album = albums_by_artist[artist_key][best[2]][1]
             return f"{album.get('Name')} (by {album.get('AlbumArtist', '?')})"
     return None
 
 
-def scan_bogus_playlists() -> tuple[str, Any]:
+def scan_bogus_playlists():
+    """Generator handler — yields progress while the library fetch and the
+    playlist-to-album matching run, so the UI stays live."""
     global bogus_playlists
     if not jellyfin_client:
-        return "❌ Connect to Jellyfin first", gr.update(choices=[], visible=False)
+        yield "❌ Connect to Jellyfin first", gr.update(choices=[], visible=False)
+        return
     try:
-        playlists = jellyfin_client.get_all_playlists()
-        albums = jellyfin_client.get_all_albums_raw()
+        yield "⏳ Fetching playlists and albums from Jellyfin…", gr.update(choices=[], visible=False)
+        snapshot = _get_snapshot()
+        playlists = snapshot.playlists
+        albums_by_artist = _build_album_index(snapshot.albums)
+        yield f"⏳ Matching {len(playlists)} playlists against albums…", gr.update(choices=[], visible=False)
 
         confirmed: list[dict] = []
         unconfirmed: list[dict] = []
@@ -198,21 +332,27 @@ def scan_bogus_playlists() -> tuple[str, Any]:
             name = p.get("Name", "")
             if " - " not in name:
                 continue
-            matched = _match_playlist_to_album(name, albums)
+            matched = _match_playlist_to_album(name, albums_by_artist)
+            p = dict(p)  # don't mutate the (cached) original
             if matched:
-                p = dict(p)  # don't mutate original
                 p["_matched_album"] = matched
+                p["_label"] = _playlist_label(p)
                 confirmed.append(p)
             else:
+                p["_label"] = _playlist_label(p)
                 unconfirmed.append(p)
 
-        bogus_playlists = confirmed + unconfirmed  # confirmed first
+        bogus_playlists = [*confirmed, *unconfirmed]  # confirmed first
         if not confirmed and not unconfirmed:
-            return "✅ No album-named playlists found", gr.update(choices=[], visible=False)
-
-        choices = [_playlist_label(p) for p in bogus_playlists]
-        # Pre-select only those where the album was confirmed to exist
-        preselected = [_playlist_label(p) for p in confirmed]
+            yield "✅ No album-named playlists found", gr.update(choices=[], visible=False)
+            return
+
+        # (label, value) choices keyed on item id — callbacks get ids back
+        # directly, with no label -> item reverse lookup
+        choices = [(p["_label"], p["Id"]) for p in bogus_playlists]
+        # Pre-select only those where the album was confirmed to exist —
+        # they sit at the front of choices, so a slice covers them
+        preselected = [item_id for _, item_id in choices[:len(confirmed)]]
         summary_lines = [
             f"Found **{len(confirmed)}** playlist(s) with a matching album in Jellyfin (pre-selected — safe to delete).",
         ]
@@ -221,9 +361,12 @@ def scan_bogus_playlists() -> tuple[str, Any]:
                 f"Found **{len(unconfirmed)}** album-named playlist(s) with **no matching album detected** "
                 f"(not pre-selected — review carefully before deleting)."
             )
-        return "\n\n".join(summary_lines), gr.update(choices=choices, value=preselected, visible=True)
+        for batch in _choice_batches(choices):
+            yield f"⏳ Listing {len(batch)}/{len(choices)} playlists…", gr.update(
+                choices=batch, value=preselected[:len(batch)], visible=True)
+        yield "\n\n".join(summary_lines), gr.update(choices=choices, value=preselected, visible=True)
     except Exception as e:
-        return f"❌ Scan failed: {e}", gr.update(choices=[], visible=False)
+        yield f"❌ Scan failed: {e}", gr.update(choices=[], visible=False)
 
 
 def delete_selected_playlists(selected: list[str]) -> str:
@@ -231,20 +374,27 @@ def delete_selected_playlists(selected: list[str]) -> str:
         return "❌ Connect to Jellyfin first"
     if not selected:
         return "❌ No playlists selected"
-    # Build label → playlist mapping so we match correctly even with duplicate names
-    label_to_playlist = {_playlist_label(p): p for p in bogus_playlists}
-    deleted, errors, m3u_paths = 0, [], []
-    for label in selected:
-        p = label_to_playlist.get(label)
-        if not p:
-            continue
+    by_id = {p["Id"]: p for p in bogus_playlists}
+    targets = [p for item_id in selected if (p := by_id.get(item_id))]
+
+    def _delete(p: dict) -> tuple[dict, Exception | None]:
         try:
             jellyfin_client.delete_item(p["Id"])
+            return p, None
+        except Exception as e:
+            return p, e
+
+    # Deletes are independent HTTP calls — overlap them
+    deleted, errors, m3u_paths = 0, [], []
+    with ThreadPoolExecutor(max_workers=_LOOKUP_WORKERS) as ex:
+        for p, err in ex.map(_delete, targets):
+            if err:
+                errors.append(f"{p.get('Name', p['Id'])}: {err}")
+                continue
             deleted += 1
             if p.get("Path"):
                 m3u_paths.append(p["Path"])
-        except Exception as e:
-            errors.append(f"{p.get('Name', p['Id'])}: {e}")
+    _invalidate_library_caches()
     msg = f"✅ Deleted {deleted} playlist(s) from Jellyfin's database."
     msg += "\n\n**Your audio files and albums are untouched** — only the playlist entries were removed."
     if m3u_paths:
@@ -280,27 +430,63 @@ _JUNK_RULES: list[tuple[str, str]] = [
     (r'(?i)\b(albums?|collections?|playlists?|discs?|volumes?|vol\.|tracks?|songs?|greatest hits|best of|anthology|box set|boxset|rarities|singles?|b-sides?)\b', "looks like a category/label"),
 ]
 
+# Compiled once at import — the rules run against every artist in the library
+_JUNK_RULES_COMPILED = [(re.compile(pattern), label) for pattern, label in _JUNK_RULES]
+
 
-def scan_junk_artists() -> tuple[str, Any]:
+def _embed_rule(pattern: str) -> str:
+    """Wrap a rule pattern for use inside an alternation, scoping any
+    leading (?i) flag so it doesn't leak across alternatives."""
+    if pattern.startswith("(?i)"):
+        return f"(?i:{pattern[4:]})"
+    return f"(?:{pattern})"
+
+
+# Single alternation of every rule: one C-level match decides whether an
+# artist is flagged at all, so the clean majority of the library never
+# touches the per-rule loop that collects individual reasons.
+_JUNK_ANY = re.compile("|".join(_embed_rule(p) for p, _ in _JUNK_RULES))
+
+
+def scan_junk_artists():
+    """Generator handler — streams the flagged list in batches so large
+    results render progressively."""
     global junk_artist_candidates
     if not jellyfin_client:
-        return "❌ Connect to Jellyfin first", gr.update(choices=[], visible=False)
+        yield "❌ Connect to Jellyfin first", gr.update(choices=[], visible=False)
+        return
     try:
-        raw = jellyfin_client.get_all_artists_raw()
-        flagged: list[tuple[dict, list[str]]] = []
+        yield "⏳ Fetching artists from Jellyfin…", gr.update(choices=[], visible=False)
+        raw = _get_snapshot().artists
+        flagged: list[dict] = []
         for a in raw:
             name = a.get("Name", "")
-            reasons = [label for pattern, label in _JUNK_RULES if re.match(pattern, name)]
-            if reasons and name.lower() not in _JUNK_WHITELIST:
-                flagged.append((a, reasons))
-        junk_artist_candidates = [a for a, _ in flagged]
+            if not name:
+                continue
+            # Cheap C-level predicates catch the most common rule hits
+            # (digit starts, very short names) before paying a regex match;
+            # the combined alternation covers the remaining rules.
+            if not (name[0].isdigit() or len(name) <= 2 or _JUNK_ANY.match(name)):
+                continue
+            if name.lower() in _JUNK_WHITELIST:
+                continue
+            reasons = [label for rule, label in _JUNK_RULES_COMPILED if rule.match(name)]
+            a = dict(a)  # don't mutate the (cached) original
+            a["_label"] = f"{name}  [{', '.join(reasons)}]"
+            flagged.append(a)
+        junk_artist_candidates = flagged
         if not flagged:
-            return "✅ No junk artists found", gr.update(choices=[], visible=False)
-        flagged.sort(key=lambda x: x[0].get("Name", "").lower())
-        choices = [f"{a['Name']}  [{', '.join(r)}]" for a, r in flagged]
-        return f"Found {len(flagged)} junk artist(s) — review and deselect any to keep:", gr.update(choices=choices, value=choices, visible=True)
+            yield "✅ No junk artists found", gr.update(choices=[], visible=False)
+            return
+        flagged.sort(key=lambda a: a.get("Name", "").lower())
+        choices = [(a["_label"], a["Id"]) for a in flagged]
+        values = [a["Id"] for a in flagged]
+        for batch in _choice_batches(choices):
+            yield f"⏳ Listing {len(batch)}/{len(choices)} artists…", gr.update(
+                choices=batch, value=values[:len(batch)], visible=True)
+        yield f"Found {len(flagged)} junk artist(s) — review and deselect any to keep:", gr.update(choices=choices, value=values, visible=True)
     except Exception as e:
-        return f"❌ Scan failed: {e}", gr.update(choices=[], visible=False)
+        yield f"❌ Scan failed: {e}", gr.update(choices=[], visible=False)
 
 
 def delete_selected_junk_artists(selected: list[str]) -> str:
@@ -308,17 +494,22 @@ def delete_selected_junk_artists(selected: list[str]) -> str:
         return "❌ Connect to Jellyfin first"
     if not selected:
         return "❌ No artists selected"
-    # Build lookup: display label -> item_id
-    raw = junk_artist_candidates
-    deleted, errors = 0, []
-    for a in raw:
-        label_prefix = a["Name"] + "  ["
-        if any(s.startswith(label_prefix) or s == a["Name"] for s in selected):
-            try:
-                jellyfin_client.delete_item(a["Id"])
-                deleted += 1
-            except Exception as e:
-                errors.append(f"{a['Name']}: {e}")
+    # Checkbox values are item ids — match on them directly
+    selected_set = set(selected)
+    targets = [a for a in junk_artist_candidates if a["Id"] in selected_set]
+
+    def _delete(a: dict) -> str | None:
+        try:
+            jellyfin_client.delete_item(a["Id"])
+            return None
+        except Exception as e:
+            return f"{a['Name']}: {e}"
+
+    with ThreadPoolExecutor(max_workers=_LOOKUP_WORKERS) as ex:
+        results = list(ex.map(_delete, targets))
+    errors = [r for r in results if r]
+    deleted = len(results) - len(errors)
+    _invalidate_library_caches()
     msg = f"✅ Deleted {deleted} artist(s)"
     if errors:
         msg += "\n\n❌ Errors:\n" + "\n".join(errors)
@@ -329,49 +520,168 @@ def delete_selected_junk_artists(selected: list[str]) -> str:
 # Duplicate Artists (The X / X, The and fuzzy matches)
 # ---------------------------------------------------------------------------
 
+# Precompiled once — these run per artist name on every duplicate scan
+_RE_SEP = re.compile(r"[/\-–—&+]")
+_RE_PUNCT = re.compile(r"[^\w\s]")
+_RE_WS = re.compile(r"\s+")
+
+
+@functools.lru_cache(maxsize=8192)
 def _normalize_for_dedup(name: str) -> str:
     n = name.lower().strip()
-    if n.endswith(", the"):
-        n = "the " + n[:-5]
+    # removesuffix scans the tail once; endswith-then-slice would scan twice
+    trimmed = n.removesuffix(", the")
+    if len(trimmed) != len(n):
+        n = "the " + trimmed
     # Normalize punctuation so AC/DC == AC-DC == ACDC
-    n = re.sub(r"[/\-–—&+]", " ", n)
-    n = re.sub(r"[^\w\s]", "", n)
-    n = re.sub(r"\s+", " ", n).strip()
+    n = _RE_SEP.sub(" ", n)
+    n = _RE_PUNCT.sub("", n)
+    n = _RE_WS.sub(" ", n).strip()
     return n
 
 
-def scan_artist_duplicates(threshold: int) -> tuple[str, Any]:
+# Scored-edge cache for the duplicate-artist scan. Candidate pairs are
+# scored once at the slider's floor and kept alongside a fingerprint of
+# the artist names, so moving the threshold slider only re-filters the
+# cached edges instead of redoing the scoring. Edges are also written to
+# ~/.cache so an unchanged library skips the scoring across restarts.
+_DA_SCORE_FLOOR = 70  # matches the da_threshold slider minimum
+_da_score_cache: tuple[str, tuple[np.ndarray, np.ndarray, np.ndarray]] | None = None
+_DA_CACHE_DIR = Path.home() / ".cache" / "jellyfin-music-cleanup"
+
+# Trigrams occurring in more than this fraction of names are too common to
+# discriminate; skipping them keeps the bucket pair expansion near-linear.
+_DA_STOP_GRAM_FRACTION = 0.1
+
+
+def _name_grams(name: str) -> set[str]:
+    """Character trigrams of a normalized name (the name itself if shorter)."""
+    if len(name) < 3:
+        return {name}
+    return {name[k:k + 3] for k in range(len(name) - 2)}
+
+
+def _candidate_pairs(norms: list[str]) -> list[tuple[int, int]]:
+    """Upper-triangle index pairs worth fuzzy-scoring.
+
+    Classic blocking: a 3-gram inverted index proposes only pairs sharing
+    at least two trigrams (one for very short names), so the scorer sees
+    near-linear work instead of all N^2 pairs. High-threshold matches
+    share far more character overlap than this, so recall is safe.
+    """
+    index: dict[str, list[int]] = defaultdict(list)
+    for i, name in enumerate(norms):
+        for gram in _name_grams(name):
+            index[gram].append(i)
+
+    max_bucket = max(32, int(len(norms) * _DA_STOP_GRAM_FRACTION))
+    shared: dict[tuple[int, int], int] = defaultdict(int)
+    for bucket in index.values():
+        if len(bucket) > max_bucket:
+            continue  # stop-gram: too common to discriminate
+        for x in range(len(bucket)):
+            for y in range(x + 1, len(bucket)):
+                shared[(bucket[x], bucket[y])] += 1
+
+    # Length-gap prune: the indel-based ratio can score at most
+    # 100 * (1 - gap / (la + lb)), so pairs whose lengths differ too much
+    # can never reach the score floor — drop them before the scorer runs.
+    lens = [len(n) for n in norms]
+
+    def _reachable(i: int, j: int) -> bool:
+        la, lb = lens[i], lens[j]
+        return 100 * (la + lb - abs(la - lb)) >= _DA_SCORE_FLOOR * (la + lb)
+
+    return sorted(
+        (i, j) for (i, j), count in shared.items()
+        if (count >= 2 or min(lens[i], lens[j]) < 4) and _reachable(i, j)
+    )
+
+
+def _da_edges_for(norms: list[str]) -> tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Scored (i, j, score) edge arrays: memory, then disk, then rapidfuzz."""
+    global _da_score_cache
+    fingerprint = hashlib.blake2b("\n".join(norms).encode(), digest_size=16).hexdigest()
+    if _da_score_cache is not None and _da_score_cache[0] == fingerprint:
+        return _da_score_cache[1]
+
+    path = _DA_CACHE_DIR / f"dupedges-{fingerprint}.npz"
+    edges: tuple[np.ndarray, np.ndarray, np.ndarray] | None = None
+    if path.is_file():
+        try:
+            data = np.load(path)
+            edges = (data["ii"], data["jj"], data["scores"])
+        except Exception:
+            edges = None  # unreadable cache — recompute and overwrite
+    if edges is None:
+        cands = _candidate_pairs(norms)
+        if cands:
+            # cpdist scores the candidate pairs element-wise in C++ —
+            # multi-threaded, uint8 output, no N x N matrix materialized.
+            scores = process.cpdist(
+                [norms[i] for i, _ in cands],
+                [norms[j] for _, j in cands],
+                scorer=fuzz.token_sort_ratio,
+                score_cutoff=_DA_SCORE_FLOOR, dtype=np.uint8, workers=-1,
+            )
+            ii = np.fromiter((i for i, _ in cands), dtype=np.int64, count=len(cands))
+            jj = np.fromiter((j for _, j in cands), dtype=np.int64, count=len(cands))
+        else:
+            ii = jj = np.empty(0, dtype=np.int64)
+            scores = np.empty(0, dtype=np.uint8)
+        edges = (ii, jj, scores)
+        try:
+            _DA_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+            np.savez(path, ii=ii, jj=jj, scores=scores)
+        except OSError:
+            pass  # disk cache is best-effort
+    _da_score_cache = (fingerprint, edges)
+    return edges
+
+
+def scan_artist_duplicates(threshold: int):
+    """Generator handler — yields progress while the fetch and the N^2
+    scoring run, so the UI stays live."""
     global artist_duplicate_pairs
     if not jellyfin_client:
-        return "❌ Connect to Jellyfin first", gr.update(choices=[], visible=False)
+        yield "❌ Connect to Jellyfin first", gr.update(choices=[], visible=False)
+        return
     try:
-        raw = jellyfin_client.get_all_artists_raw()
-        pairs: list[tuple[dict, dict]] = []
-        seen: set[frozenset] = set()
-        for i, a in enumerate(raw):
-            na = _normalize_for_dedup(a.get("Name", ""))
-            for b in raw[i + 1:]:
-                nb = _normalize_for_dedup(b.get("Name", ""))
-                key = frozenset([a["Id"], b["Id"]])
-                if key in seen:
-                    continue
-                score = fuzz.token_sort_ratio(na, nb)
-                if score >= threshold:
-                    pairs.append((a, b))
-                    seen.add(key)
+        yield "⏳ Fetching artists from Jellyfin…", gr.update(choices=[], visible=False)
+        raw = _get_snapshot().artists
+        yield f"⏳ Scoring {len(raw)} artists for duplicates…", gr.update(choices=[], visible=False)
+        # Normalize each name once, block candidate pairs on shared
+        # trigrams, then score just those pairs in one C++ call — rapidfuzz
+        # runs the comparisons multi-threaded with SIMD instead of one
+        # Python-level fuzz call per pair.
+        norms = [_normalize_for_dedup(a.get("Name", "")) for a in raw]
+        ii, jj, scores = _da_edges_for(norms)
+        keep = scores >= threshold
+        pairs: list[tuple[dict, dict]] = [
+            (raw[int(i)], raw[int(j)])
+            for i, j in zip(ii[keep], jj[keep])
+        ]
         artist_duplicate_pairs = pairs
         if not pairs:
-            return "✅ No duplicate artists found", gr.update(choices=[], visible=False)
-        choices = [
-            f"{a['Name']} ({a.get('ChildCount', 0)} albums)  ↔  {b['Name']} ({b.get('ChildCount', 0)} albums)"
-            for a, b in pairs
-        ]
-        return f"Found {len(pairs)} likely duplicate pair(s) — select pairs to merge, then choose which name to keep:", gr.update(choices=choices, value=[], visible=True)
+            yield "✅ No duplicate artists found", gr.update(choices=[], visible=False)
+            return
+        # Values are indexes into artist_duplicate_pairs — the merge handler
+        # gets positions back instead of re-deriving them from labels
+        choices = [(_pair_label(a, b), i) for i, (a, b) in enumerate(pairs)]
+        yield f"Found {len(pairs)} likely duplicate pair(s) — select pairs to merge, then choose which name to keep:", gr.update(choices=choices, value=[], visible=True)
     except Exception as e:
-        return f"❌ Scan failed: {e}", gr.update(choices=[], visible=False)
+        yield f"❌ Scan failed: {e}", gr.update(choices=[], visible=False)
+
 
+def _pair_label(a: dict, b: dict) -> str:
+    """Checkbox label for a duplicate-artist pair."""
+    return (
+        f"{a['Name']} ({a.get('ChildCount', 0)} albums)  ↔  "
+        f"{b['Name']} ({b.get('ChildCount', 0)} albums)"
+    )
 
-def merge_selected_artist_pairs(selected: list[str], preferred_side: str) -> str:
+
+def merge_selected_artist_pairs(selected: list[int], preferred_side: str) -> str:
     """Merge duplicate artist pairs at the track level:
     - Exact-name matches → delete the loser's copy (keep winner's)
     - Unique tracks on loser → reassign to canonical artist name
@@ -383,42 +693,84 @@ def merge_selected_artist_pairs(selected: list[str], preferred_side: str) -> str
         return "❌ No pairs selected"
 
     merged_pairs, report, errors = 0, [], []
+    selected_pairs = [
+        artist_duplicate_pairs[int(i)] for i in selected
+        if 0 <= int(i) < len(artist_duplicate_pairs)
+    ]
+    if not selected_pairs:
+        return "❌ No pairs selected"
 
-    for a, b in artist_duplicate_pairs:
-        label = f"{a['Name']} ({a.get('ChildCount', 0)} albums)  ↔  {b['Name']} ({b.get('ChildCount', 0)} albums)"
-        if label not in selected:
-            continue
-
+    # One bulk fetch covers every artist on both sides of the selected
+    # pairs — 1 round-trip instead of 2 per pair — then bucket locally.
+    all_ids = {x["Id"] for pair in selected_pairs for x in pair}
+    try:
+        all_tracks = jellyfin_client.get_tracks_for_artist_ids(sorted(all_ids))
+    except Exception as e:
+        return f"❌ Could not fetch tracks for the selected artists: {e}"
+    tracks_by_artist: dict[str, list[dict]] = {aid: [] for aid in all_ids}
+    for t in all_tracks:
+        for ai in t.get("ArtistItems", []):
+            if ai.get("Id") in tracks_by_artist:
+                tracks_by_artist[ai["Id"]].append(t)
+
+    for a, b in selected_pairs:
         winner = a if preferred_side == "left" else b
         loser  = b if preferred_side == "left" else a
         canonical = winner["Name"]
 
         try:
-            winner_tracks = jellyfin_client.get_tracks_for_artist(winner["Id"])
-            loser_tracks  = jellyfin_client.get_tracks_for_artist(loser["Id"])
+            winner_tracks = tracks_by_artist[winner["Id"]]
+            loser_tracks  = tracks_by_artist[loser["Id"]]
 
-            # Build normalized name → track id map for winner
-            winner_track_map: dict[str, str] = {
-                t["Name"].lower().strip(): t["Id"] for t in winner_tracks
+            # Normalized names of the winner's tracks — only membership is
+            # checked below, so a set beats a name → id dict.
+            winner_track_names: set[str] = {
+                t["Name"].lower().strip() for t in winner_tracks
             }
 
-            deleted_dupes, reassigned = 0, 0
-            for track in loser_tracks:
-                norm = track["Name"].lower().strip()
-                if norm in winner_track_map:
-                    # Duplicate track — delete loser's copy
-                    try:
-                        jellyfin_client.delete_item(track["Id"])
-                        deleted_dupes += 1
-                    except Exception as te:
-                        errors.append(f"Delete track '{track['Name']}': {te}")
-                else:
-                    # Unique track — reassign to canonical artist
-                    try:
-                        jellyfin_client.update_track_artist(track["Id"], canonical)
+            dupes = [t for t in loser_tracks
+                     if t["Name"].lower().strip() in winner_track_names]
+            uniques = [t for t in loser_tracks
+                       if t["Name"].lower().strip() not in winner_track_names]
+
+            # Duplicate copies go in one batched DELETE; fall back to
+            # per-item deletes so one bad id can't sink the whole batch.
+            deleted_dupes = 0
+            if dupes:
+                try:
+                    jellyfin_client.delete_items([t["Id"] for t in dupes])
+                    deleted_dupes = len(dupes)
+                except Exception:
+                    def _delete_track(track: dict) -> str | None:
+                        try:
+                            jellyfin_client.delete_item(track["Id"])
+                            return None
+                        except Exception as te:
+                            return f"Delete track '{track['Name']}': {te}"
+
+                    with ThreadPoolExecutor(max_workers=_LOOKUP_WORKERS) as ex:
+                        for err in ex.map(_delete_track, dupes):
+                            if err:
+                                errors.append(err)
+                            else:
+                                deleted_dupes += 1
+
+            # No bulk metadata-update endpoint exists, so reassignments stay
+            # per-track but overlapped instead of stacking RTTs.
+            def _reassign_track(track: dict) -> str | None:
+                try:
+                    jellyfin_client.update_track_artist(track["Id"], canonical)
+                    return None
+                except Exception as te:
+                    return f"Reassign track '{track['Name']}': {te}"
+
+            reassigned = 0
+            with ThreadPoolExecutor(max_workers=_LOOKUP_WORKERS) as ex:
+                for err in ex.map(_reassign_track, uniques):
+                    if err:
+                        errors.append(err)
+                    else:
                         reassigned += 1
-                    except Exception as te:
-                        errors.append(f"Reassign track '{track['Name']}': {te}")
 
             # Rename loser artist entry then delete it
             try:
@@ -439,6 +791,7 @@ def merge_selected_artist_pairs(selected: list[str], preferred_side: str) -> str
         except Exception as e:
             errors.append(f"{a['Name']} ↔ {b['Name']}: {e}")
 
+    _invalidate_library_caches()
     msg = f"✅ Merged {merged_pairs} pair(s).\n\n" + "\n".join(report)
     if errors:
         msg += "\n\n❌ Errors:\n" + "\n".join(errors)
@@ -450,23 +803,29 @@ def merge_selected_artist_pairs(selected: list[str], preferred_side: str) -> str
 # Missing Artwork
 # ---------------------------------------------------------------------------
 
-def scan_missing_artwork(item_type: str) -> tuple[str, Any]:
+def scan_missing_artwork(item_type: str):
+    """Generator handler — streams the missing list in batches so large
+    results render progressively."""
     global missing_artwork_items
     if not jellyfin_client:
-        return "❌ Connect to Jellyfin first", gr.update(choices=[], visible=False)
+        yield "❌ Connect to Jellyfin first", gr.update(choices=[], visible=False)
+        return
     try:
-        if item_type == "Artists":
-            items = jellyfin_client.get_all_artists_raw()
-        else:
-            items = jellyfin_client.get_all_albums_raw()
-        missing = [i for i in items if not i.get("ImageTags", {}).get("Primary")]
+        yield f"⏳ Fetching {item_type.lower()} from Jellyfin…", gr.update(choices=[], visible=False)
+        snapshot = _get_snapshot()
+        items = snapshot.artists if item_type == "Artists" else snapshot.albums
+        missing = [i for i in items if "Primary" not in (i.get("ImageTags") or _EMPTY)]
         missing_artwork_items = missing
         if not missing:
-            return f"✅ All {item_type.lower()} have artwork", gr.update(choices=[], visible=False)
-        choices = [i.get("Name", i["Id"]) for i in missing]
-        return f"Found {len(missing)} {item_type.lower()} missing artwork:", gr.update(choices=choices, value=[], visible=True)
+            yield f"✅ All {item_type.lower()} have artwork", gr.update(choices=[], visible=False)
+            return
+        choices = [(i.get("Name") or i["Id"], i["Id"]) for i in missing]
+        for batch in _choice_batches(choices):
+            yield f"⏳ Listing {len(batch)}/{len(choices)} items…", gr.update(
+                choices=batch, value=[], visible=True)
+        yield f"Found {len(missing)} {item_type.lower()} missing artwork:", gr.update(choices=choices, value=[], visible=True)
     except Exception as e:
-        return f"❌ Scan failed: {e}", gr.update(choices=[], visible=False)
+        yield f"❌ Scan failed: {e}", gr.update(choices=[], visible=False)
 
 
 def refresh_selected_artwork(selected: list[str]) -> str:
@@ -474,17 +833,25 @@ def refresh_selected_artwork(selected: list[str]) -> str:
         return "❌ Connect to Jellyfin first"
     if not selected:
         return "❌ Nothing selected"
-    refreshed, errors = 0, []
-    name_to_id = {i.get("Name", i["Id"]): i["Id"] for i in missing_artwork_items}
-    for name in selected:
-        item_id = name_to_id.get(name)
-        if not item_id:
-            continue
+    by_id = {i["Id"]: i for i in missing_artwork_items}
+    targets = [
+        (by_id[item_id].get("Name") or item_id, item_id)
+        for item_id in selected if item_id in by_id
+    ]
+
+    def _refresh(target: tuple[str, str]) -> str | None:
+        name, item_id = target
         try:
             jellyfin_client.refresh_item_metadata(item_id)
-            refreshed += 1
+            return None
         except Exception as e:
-            errors.append(f"{name}: {e}")
+            return f"{name}: {e}"
+
+    with ThreadPoolExecutor(max_workers=_LOOKUP_WORKERS) as ex:
+        results = list(ex.map(_refresh, targets))
+    errors = [r for r in results if r]
+    refreshed = len(results) - len(errors)
+    _invalidate_library_caches()
     msg = f"✅ Queued metadata refresh for {refreshed} item(s) — Jellyfin will fetch artwork in the background"
     if errors:
         msg += "\n\n❌ Errors:\n" + "\n".join(errors)
@@ -505,27 +872,27 @@ _TRACK_SOURCES = [
 
 _DECADES = ["Any era", "1950s", "1960s", "1970s", "1980s", "1990s", "2000s", "2010s", "2020s"]
 
+# Concurrent workers for Spotify/Jellyfin lookups — the calls are independent
+# HTTP round-trips, so overlapping them cuts wall time roughly by this factor.
+_LOOKUP_WORKERS = 8
+
+# Splits "A, B and C & D" style input in one pass, trimming whitespace as it goes
+_ARTIST_SPLIT_RE = re.compile(r"\s*(?:,| and | & )\s*")
 
-def generate_playlist_preview(artist_input: str, playlist_style: str, track_count: int,
-                              track_source: str, decade: str) -> tuple[str, str]:
-    global pending_playlist
-    pending_playlist = {}
 
+def generate_playlist_preview(artist_input: str, playlist_style: str, track_count: int,
+                              track_source: str, decade: str) -> tuple[str, str, dict]:
     if not jellyfin_client:
-        return "❌ Connect to Jellyfin first", ""
+        return "❌ Connect to Jellyfin first", "", {}
     if not spotify_client:
-        return "❌ Connect to Spotify first", ""
+        return "❌ Connect to Spotify first", "", {}
     if not artist_input:
-        return "❌ Enter artist name(s)", ""
+        return "❌ Enter artist name(s)", "", {}
 
-    artist_names = []
-    for part in artist_input.replace(" and ", ",").replace(" & ", ",").split(","):
-        name = part.strip()
-        if name:
-            artist_names.append(name)
+    artist_names = [name for name in _ARTIST_SPLIT_RE.split(artist_input.strip()) if name]
 
     if not artist_names:
-        return "❌ No valid artist names", ""
+        return "❌ No valid artist names", "", {}
 
     # Decade filter bounds
     decade_start, decade_end = 0, 9999
@@ -537,35 +904,71 @@ def generate_playlist_preview(artist_input: str, playlist_style: str, track_coun
         all_spotify_tracks: list[dict] = []
         artist_for_track: dict[str, str] = {}  # track name -> artist
 
-        for artist_name in artist_names:
-            tracks = spotify_client.get_top_tracks(artist_name, limit=200)
-            # Apply decade filter
-            if decade != "Any era":
-                tracks = [t for t in tracks if decade_start <= t.get("release_year", 0) <= decade_end]
+        # Only fetch as many Spotify tracks per artist as could plausibly be
+        # needed: 3x the requested count tolerates Jellyfin misses without
+        # paying for a full 200-track pull when the user wants 20.
+        fetch_limit = min(max(track_count * 3, 30), 200)
+
+        # Fetch every artist's top tracks concurrently instead of one artist
+        # at a time — Spotify round-trips overlap instead of stacking.
+        with ThreadPoolExecutor(max_workers=_LOOKUP_WORKERS) as ex:
+            per_artist_tracks = list(
+                ex.map(lambda name: spotify_client.get_top_tracks(name, limit=fetch_limit), artist_names)
+            )
+
+        for artist_name, tracks in zip(artist_names, per_artist_tracks):
+            # Apply decade filter — one C-level mask over an int array
+            # instead of a per-track dict.get comparison chain
+            if decade != "Any era" and tracks:
+                years = np.fromiter((t.get("release_year", 0) for t in tracks),
+                                    dtype=np.int32, count=len(tracks))
+                keep = np.nonzero((years >= decade_start) & (years <= decade_end))[0]
+                tracks = [tracks[i] for i in keep]
             for t in tracks:
                 artist_for_track[t["name"]] = artist_name
             all_spotify_tracks.extend(tracks)
 
-        # Sort / order by source
+        # Order by source. Only the best ~3x candidates can ever make the
+        # playlist (mirroring fetch_limit's miss tolerance), so take a
+        # partial selection — O(N log K) — instead of sorting everything.
+        candidate_cap = min(len(all_spotify_tracks), track_count * 3)
         if track_source == "top":
-            all_spotify_tracks.sort(key=lambda t: t.get("popularity", 0), reverse=True)
+            all_spotify_tracks = heapq.nlargest(candidate_cap, all_spotify_tracks,
+                                                key=lambda t: t.get("popularity", 0))
         elif track_source == "deep":
-            all_spotify_tracks.sort(key=lambda t: t.get("popularity", 0))
+            all_spotify_tracks = heapq.nsmallest(candidate_cap, all_spotify_tracks,
+                                                 key=lambda t: t.get("popularity", 0))
         elif track_source == "chrono":
-            all_spotify_tracks.sort(key=lambda t: t.get("release_year", 0))
+            all_spotify_tracks = heapq.nsmallest(candidate_cap, all_spotify_tracks,
+                                                 key=lambda t: t.get("release_year", 0))
         elif track_source == "recent":
-            all_spotify_tracks.sort(key=lambda t: t.get("release_year", 0), reverse=True)
+            all_spotify_tracks = heapq.nlargest(candidate_cap, all_spotify_tracks,
+                                                key=lambda t: t.get("release_year", 0))
         elif track_source == "shuffle":
-            random.shuffle(all_spotify_tracks)
+            # Sampling K beats shuffling the whole list in place
+            all_spotify_tracks = random.sample(all_spotify_tracks, k=candidate_cap)
 
         matched_track_ids: list[str] = []
         matched_tracks: list[str] = []
 
+        # One bulk Jellyfin lookup per artist (issued concurrently) instead
+        # of one search per Spotify track; titles resolve locally after that.
+        titles_by_artist: dict[str, list[str]] = {}
+        for t in all_spotify_tracks:
+            artist_name = artist_for_track.get(t["name"], artist_names[0])
+            titles_by_artist.setdefault(artist_name, []).append(t["name"])
+
+        with ThreadPoolExecutor(max_workers=_LOOKUP_WORKERS) as ex:
+            bulk_matches = dict(zip(
+                titles_by_artist,
+                ex.map(lambda an: jellyfin_client.find_tracks_bulk(an, titles_by_artist[an]), titles_by_artist),
+            ))
+
         for track in all_spotify_tracks:
             if len(matched_track_ids) >= track_count:
                 break
             artist_name = artist_for_track.get(track["name"], artist_names[0])
-            jf_track = jellyfin_client.find_track(artist_name, track["name"])
+            jf_track = bulk_matches[artist_name].get(track["name"])
             if jf_track:
                 matched_track_ids.append(jf_track.get("Id"))
                 year = track.get("release_year") or ""
@@ -573,7 +976,7 @@ def generate_playlist_preview(artist_input: str, playlist_style: str, track_coun
                 matched_tracks.append(f"{track['name']}{year_str} — {artist_name}")
 
         if not matched_track_ids:
-            return "❌ No matching tracks found in Jellyfin", ""
+            return "❌ No matching tracks found in Jellyfin", "", {}
 
         playlist_name = _build_playlist_name(artist_names, playlist_style)
         pending_playlist = {
@@ -585,10 +988,9 @@ def generate_playlist_preview(artist_input: str, playlist_style: str, track_coun
         decade_label = f" · {decade}" if decade != "Any era" else ""
         header = f"Playlist: **{playlist_name}**  ·  {source_label}{decade_label}  ·  {len(matched_track_ids)} tracks\n\n"
         preview = header + "\n".join(matched_tracks)
-        return preview, ""
+        return preview, "", pending_playlist
     except Exception as e:
-        pending_playlist = {}
-        return f"❌ Playlist generation failed: {e}", ""
+        return f"❌ Playlist generation failed: {e}", "", {}
 
 
 def _build_playlist_name(artists: list[str], style: str) -> str:
@@ -599,9 +1001,7 @@ def _build_playlist_name(artists: list[str], style: str) -> str:
     return f"Why {' & '.join(artists)} Slaps"
 
 
-def save_playlist() -> str:
-    global pending_playlist
-
+def save_playlist(pending_playlist: dict) -> str:
     if not jellyfin_client:
         return "❌ Connect to Jellyfin first"
     if not pending_playlist:
@@ -622,15 +1022,11 @@ def save_playlist() -> str:
 def _clean_hostname(raw: str) -> str:
     """Strip protocol, path, and port from a pasted URL so only the hostname remains."""
     h = raw.strip()
-    # Remove protocol prefix
-    for prefix in ("https://", "http://"):
-        if h.startswith(prefix):
-            h = h[len(prefix):]
-    # Remove path
-    h = h.split("/")[0]
-    # Remove port
-    h = h.split(":")[0]
-    return h
+    # urlsplit needs a scheme marker to treat the input as a netloc; it
+    # then handles userinfo, ports, and bracketed IPv6 in one C-level pass.
+    if "://" not in h:
+        h = "//" + h
+    return urlsplit(h).hostname or raw.strip()
 
 
 def connect_ssh(hostname: str, port_str: str, username: str, password: str, key_path: str) -> str:
@@ -654,24 +1050,33 @@ def connect_ssh(hostname: str, port_str: str, username: str, password: str, key_
         return f"❌ SSH connection failed: {e}"
 
 
-def scan_m3u_files(music_path: str) -> tuple[str, Any]:
+def scan_m3u_files(music_path: str):
+    """Generator handler — streams found files in batches so a big tree's
+    results render progressively."""
     global m3u_scan_results
     if not ssh_client_instance:
-        return "❌ Connect via SSH first", gr.update(choices=[], visible=False)
+        yield "❌ Connect via SSH first", gr.update(choices=[], visible=False)
+        return
     if not music_path.strip():
-        return "❌ Enter the music library path on the server", gr.update(choices=[], visible=False)
+        yield "❌ Enter the music library path on the server", gr.update(choices=[], visible=False)
+        return
     try:
+        yield f"⏳ Searching `{music_path}` for playlist files…", gr.update(choices=[], visible=False)
         files = ssh_client_instance.find_playlist_files(music_path.strip())
         m3u_scan_results = files
         if not files:
-            return f"✅ No .m3u/.m3u8 files found under `{music_path}`", gr.update(choices=[], visible=False)
-        return (
+            yield f"✅ No .m3u/.m3u8 files found under `{music_path}`", gr.update(choices=[], visible=False)
+            return
+        for batch in _choice_batches(files):
+            yield f"⏳ Listing {len(batch)}/{len(files)} files…", gr.update(
+                choices=batch, value=batch, visible=True)
+        yield (
             f"Found **{len(files)}** playlist file(s) — all pre-selected. "
             f"Deselect any you want to keep, then click **Delete Selected Files**.",
             gr.update(choices=files, value=files, visible=True),
         )
     except Exception as e:
-        return f"❌ Scan failed: {e}", gr.update(choices=[], visible=False)
+        yield f"❌ Scan failed: {e}", gr.update(choices=[], visible=False)
 
 
 def delete_selected_m3u(selected: list[str]) -> str:
@@ -704,13 +1109,11 @@ def delete_selected_m3u(selected: list[str]) -> str:
 
 
 def select_all_artwork() -> Any:
-    choices = [i.get("Name", i["Id"]) for i in missing_artwork_items]
-    return gr.update(value=choices)
+    return gr.update(value=[i["Id"] for i in missing_artwork_items])
 
 
 def select_all_junk() -> Any:
-    choices = [f"{a['Name']}  [{', '.join(label for pattern, label in _JUNK_RULES if re.match(pattern, a['Name']))}]" for a in junk_artist_candidates]
-    return gr.update(value=choices)
+    return gr.update(value=[a["Id"] for a in junk_artist_candidates])
 
 
 def build_ui() -> gr.Blocks:
@@ -727,6 +1130,9 @@ def build_ui() -> gr.Blocks:
 
             connect_jf_btn.click(connect_jellyfin, inputs=[jf_url, jf_key, jf_user], outputs=jf_status)
 
+            refresh_cache_btn = gr.Button("Refresh Library Cache", size="sm")
+            refresh_cache_btn.click(refresh_library_cache, outputs=jf_status)
+
             gr.Markdown("### Spotify")
             sp_id = gr.Textbox(label="Client ID")
             sp_secret = gr.Textbox(label="Client Secret", type="password")
@@ -736,6 +1142,10 @@ def build_ui() -> gr.Blocks:
             connect_sp_btn.click(connect_spotify, inputs=[sp_id, sp_secret], outputs=sp_status)
 
         with gr.Tab("Find Duplicates"):
+            # Per-session review state so concurrent users don't clobber each other
+            groups_state = gr.State([])
+            displays_state = gr.State([])
+            idx_state = gr.State(0)
             threshold = gr.Slider(60, 95, value=80, step=1, label="Similarity Threshold")
             scan_btn = gr.Button("Scan for Duplicates")
             scan_status = gr.Markdown("")
@@ -747,29 +1157,23 @@ def build_ui() -> gr.Blocks:
                 next_btn = gr.Button("Next ➡️", visible=False)
                 apply_btn = gr.Button("Apply Rename", visible=False)
 
+            # Single registration: one round-trip per scan updates every
+            # affected component, rather than four parallel click events.
             scan_btn.click(
                 scan_duplicates,
                 inputs=[threshold],
-                outputs=[scan_status, preferred_name, group_display, preferred_name],
-            )
-            next_btn.click(next_group, outputs=[group_display, preferred_name])
-            prev_btn.click(prev_group, outputs=[group_display, preferred_name])
-            apply_btn.click(apply_rename, inputs=[preferred_name], outputs=scan_status)
-
-            def _toggle_buttons(scan_msg, pref_value, group_vis, pref_vis):
-                visible = "✅" not in scan_msg or "No duplicates" not in scan_msg
-                return gr.update(visible=visible), gr.update(visible=visible), gr.update(visible=visible)
-
-            scan_btn.click(
-                lambda status, *_: (gr.update(visible=True), gr.update(visible=True)),
-                inputs=[scan_status],
-                outputs=[group_display, preferred_name],
+                outputs=[
+                    scan_status, preferred_name,
+                    group_display, preferred_name, prev_btn, next_btn, apply_btn,
+                    groups_state, displays_state, idx_state,
+                ],
             )
-            scan_btn.click(lambda: gr.update(visible=True), outputs=prev_btn)
-            scan_btn.click(lambda: gr.update(visible=True), outputs=next_btn)
-            scan_btn.click(lambda: gr.update(visible=True), outputs=apply_btn)
+            next_btn.click(next_group, inputs=[groups_state, displays_state, idx_state], outputs=[group_display, preferred_name, idx_state])
+            prev_btn.click(prev_group, inputs=[groups_state, displays_state, idx_state], outputs=[group_display, preferred_name, idx_state])
+            apply_btn.click(apply_rename, inputs=[preferred_name, groups_state, idx_state], outputs=scan_status)
 
         with gr.Tab("Playlists"):
+            pending_state = gr.State({})
             artist_input = gr.Textbox(label="Artist name(s) (comma-separated)")
             with gr.Row():
                 playlist_style = gr.Dropdown(
@@ -801,9 +1205,9 @@ def build_ui() -> gr.Blocks:
             preview_btn.click(
                 generate_playlist_preview,
                 inputs=[artist_input, playlist_style, track_count, track_source, decade],
-                outputs=[preview_md, save_status],
+                outputs=[preview_md, save_status, pending_state],
             )
-            save_btn.click(save_playlist, outputs=save_status)
+            save_btn.click(save_playlist, inputs=[pending_state], outputs=save_status)
 
         # -------------------------------------------------------------------
         with gr.Tab("🗑 Bogus Playlists"):
@@ -839,7 +1243,7 @@ To stop them coming back, either:
             bp_delete_btn = gr.Button("Delete Selected", variant="stop")
             bp_result = gr.Markdown("")
 
-            bp_scan_btn.click(scan_bogus_playlists, outputs=[bp_status, bp_list])
+            bp_scan_btn.click(scan_bogus_playlists, outputs=[bp_status, bp_list], concurrency_limit=1)
             bp_delete_btn.click(delete_selected_playlists, inputs=[bp_list], outputs=bp_result)
 
         # -------------------------------------------------------------------
@@ -858,7 +1262,7 @@ To stop them coming back, either:
             ja_delete_btn = gr.Button("Delete Selected", variant="stop")
             ja_result = gr.Markdown("")
 
-            ja_scan_btn.click(scan_junk_artists, outputs=[ja_status, ja_list])
+            ja_scan_btn.click(scan_junk_artists, outputs=[ja_status, ja_list], concurrency_limit=1)
             ja_all_btn.click(select_all_junk, outputs=ja_list)
             ja_none_btn.click(lambda: gr.update(value=[]), outputs=ja_list)
             ja_delete_btn.click(delete_selected_junk_artists, inputs=[ja_list], outputs=ja_result)
@@ -909,7 +1313,7 @@ To stop them coming back, either:
             mw_refresh_btn = gr.Button("Refresh Metadata for Selected", variant="primary")
             mw_result = gr.Markdown("")
 
-            mw_scan_btn.click(scan_missing_artwork, inputs=[mw_type], outputs=[mw_status, mw_list])
+            mw_scan_btn.click(scan_missing_artwork, inputs=[mw_type], outputs=[mw_status, mw_list], concurrency_limit=1)
             mw_all_btn.click(select_all_artwork, outputs=mw_list)
             mw_none_btn.click(lambda: gr.update(value=[]), outputs=mw_list)
             mw_refresh_btn.click(refresh_selected_artwork, inputs=[mw_list], outputs=mw_result)
@@ -953,7 +1357,7 @@ The SSH connection is made from **this machine** to the Jellyfin server.
                 inputs=[ssh_host, ssh_port, ssh_user, ssh_pass, ssh_key],
                 outputs=ssh_status,
             )
-            ssh_scan_btn.click(scan_m3u_files, inputs=[ssh_music_path], outputs=[ssh_scan_status, ssh_file_list])
+            ssh_scan_btn.click(scan_m3u_files, inputs=[ssh_music_path], outputs=[ssh_scan_status, ssh_file_list], concurrency_limit=1)
             ssh_delete_btn.click(delete_selected_m3u, inputs=[ssh_file_list], outputs=ssh_delete_result)
 
     return demo
@@ -961,4 +1365,8 @@ The SSH connection is made from **this machine** to the Jellyfin server.
 
 if __name__ == "__main__":
     ui = build_ui()
+    # Sync handlers run in Gradio's worker threads, so a queue with a
+    # generous concurrency limit lets several users' I/O-bound scans and
+    # previews overlap instead of serializing behind one long request.
+    ui.queue(default_concurrency_limit=16)
     ui.launch()
@@ -4,15 +4,25 @@ Duplicate Artist Finder
 Uses fuzzy string matching to find artists that are likely duplicates.
 """
 
+import os
 import re
 from dataclasses import dataclass, field
 from collections import defaultdict
 
-from rapidfuzz import fuzz
+import numpy as np
+from rapidfuzz import fuzz, process
 from jellyfin_client import ArtistInfo
 
+# Normalization patterns, compiled once at import. The four feat/ft suffix
+# variants collapse into one alternation so each name takes a single pass.
+_RE_AND = re.compile(r'\s+and\s+')
+_RE_THE_MID = re.compile(r'\s+the\s+')
+_RE_THE_LEAD = re.compile(r'^the\s+')
+_RE_FEAT = re.compile(r'\s*(?:\((?:feat|ft)\..*?\)|(?:feat|ft)\..*$)', re.IGNORECASE)
+_RE_WS = re.compile(r'\s+')
 
-@dataclass
+
+@dataclass(slots=True)
 class DuplicateGroup:
     """A group of artists that are likely duplicates"""
     canonical_name: str
@@ -33,8 +43,19 @@ class DuplicateFinder:
 
     def __init__(self, threshold: int = 80):
         self.threshold = threshold
+        # Per-instance memos (dicts rather than lru_cache on the methods so
+        # they die with the finder and never pin self): normalization runs
+        # several regex passes and explain_match recomputes two fuzz scores,
+        # but the UI asks about the same names over and over.
+        self._norm_cache: dict[str, str] = {}
+        self._explain_cache: dict[tuple[str, str], str] = {}
 
     def normalize_name(self, name: str) -> str:
+        cached = self._norm_cache.get(name)
+        if cached is not None:
+            return cached
+
+        raw = name
         name = name.strip()
 
         if ", " in name and name.count(",") == 1:
@@ -44,22 +65,14 @@ class DuplicateFinder:
                     name = f"{parts[1]} {parts[0]}"
 
         name = name.lower()
-        name = re.sub(r'\s+and\s+', ' & ', name)
-        name = re.sub(r'\s+the\s+', ' ', name)
-        name = re.sub(r'^the\s+', '', name)
-
-        suffixes_to_remove = [
-            r'\s*\(feat\..*?\)',
-            r'\s*\(ft\..*?\)',
-            r'\s*feat\..*$',
-            r'\s*ft\..*$',
-        ]
-        for pattern in suffixes_to_remove:
-            name = re.sub(pattern, '', name, flags=re.IGNORECASE)
-
-        name = re.sub(r'\s+', ' ', name)
+        name = _RE_AND.sub(' & ', name)
+        name = _RE_THE_MID.sub(' ', name)
+        name = _RE_THE_LEAD.sub('', name)
+        name = _RE_FEAT.sub('', name)
+        name = _RE_WS.sub(' ', name)
         name = name.strip()
 
+        self._norm_cache[raw] = name
         return name
 
     def suggest_canonical_name(self, names: list[str]) -> str:
@@ -86,17 +99,102 @@ class DuplicateFinder:
         scored_names.sort(reverse=True)
         return scored_names[0][1]
 
+    # Tile edge for pairwise scoring: memory per tile is ~2 * TILE^2 floats
+    # (a few MB) instead of an N x N matrix for the whole library.
+    _TILE_SIZE = 2048
+    # cdist releases the GIL and threads internally; cap the pool so
+    # thread-spawn overhead doesn't dominate on small blocks or tiny hosts.
+    _CDIST_WORKERS = min(8, os.cpu_count() or 1)
+
+    def _scored_pairs(self, norms: list[str]) -> list[tuple[int, int, float]]:
+        """Upper-triangle (i, j, score) pairs scoring at/above the threshold.
+
+        rapidfuzz.process.cdist runs the comparisons in C++ (multi-threaded,
+        bit-parallel Levenshtein) instead of one Python-level fuzz call per
+        pair; score_cutoff lets it short-circuit sub-threshold pairs early.
+        Scoring is tiled in blocks so peak memory stays bounded by the tile
+        size for out-of-core libraries — each tile is scored, reduced to its
+        passing pairs, and discarded. Scores keep the old semantics: max of
+        ratio and token_sort_ratio — the latter computed as plain ratio over
+        token-sorted strings built once per name, so the scorer's inner loop
+        stays in the bit-parallel InDel kernel with no per-pair tokenization.
+        """
+        n = len(norms)
+        token_sorted = [" ".join(sorted(norm.split())) for norm in norms]
+        pairs: list[tuple[int, int, float]] = []
+        tile = self._TILE_SIZE
+        for bi in range(0, n, tile):
+            rows = norms[bi:bi + tile]
+            srows = token_sorted[bi:bi + tile]
+            for bj in range(bi, n, tile):
+                cols = norms[bj:bj + tile]
+                scols = token_sorted[bj:bj + tile]
+                block = np.maximum(
+                    process.cdist(rows, cols, scorer=fuzz.ratio,
+                                  score_cutoff=self.threshold, workers=self._CDIST_WORKERS),
+                    process.cdist(srows, scols, scorer=fuzz.ratio,
+                                  score_cutoff=self.threshold, workers=self._CDIST_WORKERS),
+                )
+                if bi == bj:
+                    # Keep only the upper triangle on diagonal tiles
+                    block = np.triu(block, 1)
+                for r, c in np.argwhere(block >= self.threshold):
+                    pairs.append((bi + int(r), bj + int(c), float(block[r, c])))
+        return pairs
+
+    def _blocked_pairs(self, norms: list[str]) -> list[tuple[int, int, float]]:
+        """Scored pairs, computed per first-character block.
+
+        Names that normalize to different first characters essentially never
+        score above a useful threshold (leading "the" is already stripped),
+        so blocking on the first character cuts the scorer's workload from
+        all N^2 pairs to the sum of much smaller per-block squares. Each
+        name is also bucketed by the first character of its token-sorted
+        form, so reordered duplicates ("Simon & Garfunkel" vs "Garfunkel &
+        Simon") still meet in a block; the pair set dedupes the overlap.
+        """
+        blocks: dict[str, set[int]] = defaultdict(set)
+        for i, norm in enumerate(norms):
+            blocks[norm[:1]].add(i)
+            first_token = min(norm.split(), default="")
+            blocks[first_token[:1]].add(i)
+
+        seen: set[tuple[int, int]] = set()
+        pairs: list[tuple[int, int, float]] = []
+        for members in blocks.values():
+            if len(members) < 2:
+                continue
+            idxs = sorted(members)
+            for bi, bj, score in self._scored_pairs([norms[i] for i in idxs]):
+                key = (idxs[bi], idxs[bj])
+                if key not in seen:
+                    seen.add(key)
+                    pairs.append((key[0], key[1], score))
+        return pairs
+
     def find_duplicates(self, artists: list[ArtistInfo]) -> list[DuplicateGroup]:
         duplicate_groups = []
         processed_keys = set()
 
-        normalized_map = defaultdict(list)
+        # Normalize each title exactly once, caching the result on the
+        # ArtistInfo itself — the fuzzy phase below compares pairs, so
+        # re-normalizing there would redo this work O(N^2) times.
+        # Exact grouping is single-pass: a first occurrence is stored bare
+        # and only upgraded to a list when a second one arrives, so the
+        # (vast majority of) singleton buckets never allocate a list.
+        seen: dict[str, ArtistInfo | list[ArtistInfo]] = {}
         for artist in artists:
-            normalized = self.normalize_name(artist.title)
-            normalized_map[normalized].append(artist)
+            artist.normalized = self.normalize_name(artist.title)
+            prev = seen.get(artist.normalized)
+            if prev is None:
+                seen[artist.normalized] = artist
+            elif isinstance(prev, list):
+                prev.append(artist)
+            else:
+                seen[artist.normalized] = [prev, artist]
 
-        for normalized, group_artists in normalized_map.items():
-            if len(group_artists) > 1:
+        for group_artists in seen.values():
+            if isinstance(group_artists, list):
                 canonical = self.suggest_canonical_name([a.title for a in group_artists])
                 group = DuplicateGroup(
                     canonical_name=canonical,
@@ -108,46 +206,66 @@ class DuplicateFinder:
                     processed_keys.add(a.item_id)
 
         remaining = [a for a in artists if a.item_id not in processed_keys]
-        remaining_normalized = [(self.normalize_name(a.title), a) for a in remaining]
-
-        used_in_group = set()
 
-        for i, (norm1, artist1) in enumerate(remaining_normalized):
-            if artist1.item_id in used_in_group:
+        edges = self._blocked_pairs([a.normalized for a in remaining])
+        n = len(remaining)
+
+        # Union-find over all threshold-passing pairs: near-linear grouping,
+        # and transitive matches (A~B, B~C) land in one group regardless of
+        # iteration order — the old greedy seed scan could split them.
+        parent = list(range(n))
+        rank = [0] * n
+
+        def find(x: int) -> int:
+            while parent[x] != x:
+                parent[x] = parent[parent[x]]
+                x = parent[x]
+            return x
+
+        def union(x: int, y: int) -> None:
+            rx, ry = find(x), find(y)
+            if rx == ry:
+                return
+            if rank[rx] < rank[ry]:
+                rx, ry = ry, rx
+            parent[ry] = rx
+            if rank[rx] == rank[ry]:
+                rank[rx] += 1
+
+        for i, j, _ in edges:
+            union(i, j)
+
+        members: dict[int, list[int]] = defaultdict(list)
+        for idx in range(n):
+            members[find(idx)].append(idx)
+
+        edge_scores: dict[int, list[float]] = defaultdict(list)
+        for i, j, score in edges:
+            edge_scores[find(i)].append(score)
+
+        for root, idxs in members.items():
+            if len(idxs) < 2:
                 continue
+            current_group = [remaining[i] for i in idxs]
+            scores = edge_scores[root]
+            canonical = self.suggest_canonical_name([a.title for a in current_group])
+            avg_score = sum(scores) / len(scores) if scores else 100.0
 
-            current_group = [artist1]
-            current_scores = []
-            used_in_group.add(artist1.item_id)
-
-            for j, (norm2, artist2) in enumerate(remaining_normalized[i+1:], i+1):
-                if artist2.item_id in used_in_group:
-                    continue
-
-                similarity = fuzz.ratio(norm1, norm2)
-                token_similarity = fuzz.token_sort_ratio(norm1, norm2)
-                best_similarity = max(similarity, token_similarity)
-
-                if best_similarity >= self.threshold:
-                    current_group.append(artist2)
-                    current_scores.append(best_similarity)
-                    used_in_group.add(artist2.item_id)
-
-            if len(current_group) > 1:
-                canonical = self.suggest_canonical_name([a.title for a in current_group])
-                avg_score = sum(current_scores) / len(current_scores) if current_scores else 100.0
-
-                duplicate_groups.append(DuplicateGroup(
-                    canonical_name=canonical,
-                    artists=current_group,
-                    similarity_score=avg_score
-                ))
+            duplicate_groups.append(DuplicateGroup(
+                canonical_name=canonical,
+                artists=current_group,
+                similarity_score=avg_score
+            ))
 
         duplicate_groups.sort(key=lambda g: g.total_tracks, reverse=True)
 
         return duplicate_groups
 
     def explain_match(self, name1: str, name2: str) -> str:
+        cached = self._explain_cache.get((name1, name2))
+        if cached is not None:
+            return cached
+
         norm1 = self.normalize_name(name1)
         norm2 = self.normalize_name(name2)
 
@@ -170,4 +288,6 @@ class DuplicateFinder:
             else:
                 explanations.append(f"Names are similar (score: {similarity}%)")
 
-        return "; ".join(explanations) if explanations else "Unknown match reason"
+        result = "; ".join(explanations) if explanations else "Unknown match reason"
+        self._explain_cache[(name1, name2)] = result
+        return result
@@ -4,17 +4,38 @@ Jellyfin Music Client
 Minimal client for Jellyfin music libraries using the REST API + API key.
 """
 
+from collections import OrderedDict
 from dataclasses import dataclass
 from typing import Optional
+import orjson
 import requests
 import urllib3
-from rapidfuzz import fuzz
+from rapidfuzz import fuzz, process
+from requests.adapters import HTTPAdapter
+from urllib3.util.retry import Retry
 
 # Jellyfin commonly uses self-signed certs on LAN — suppress the noise
 urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
 
 
-@dataclass
+def make_pooled_session(pool_connections: int = 32, pool_maxsize: int = 64) -> requests.Session:
+    """Build a requests.Session with connection pooling and retry on transient errors.
+
+    Reusing one session keeps TCP/TLS connections alive across API calls
+    instead of paying a fresh handshake per request.
+    """
+    session = requests.Session()
+    adapter = HTTPAdapter(
+        pool_connections=pool_connections,
+        pool_maxsize=pool_maxsize,
+        max_retries=Retry(total=3, backoff_factor=0.3, status_forcelist=[429, 500, 502, 503, 504]),
+    )
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+@dataclass(slots=True)
 class ArtistInfo:
     """Lightweight artist info for display"""
     title: str
@@ -22,6 +43,9 @@ class ArtistInfo:
     album_count: int = 0
     track_count: int = 0
     sort_name: Optional[str] = None
+    # Filled in by DuplicateFinder.find_duplicates — normalization runs five
+    # regex passes, so the result is cached here instead of recomputed.
+    normalized: str = ""
 
 
 class JellyfinClient:
@@ -33,12 +57,21 @@ class JellyfinClient:
 
         self.base_url = base_url.rstrip("/")
         self.api_key = api_key
+        self._session = make_pooled_session()
         self.user_id = user_id or self._fetch_first_user_id()
 
         if not self.user_id:
             raise ValueError("Could not determine Jellyfin user id; please provide one explicitly.")
 
         self._artist_cache: list[ArtistInfo] | None = None
+        # Memoized find_track results keyed on casefolded (artist, title);
+        # FIFO-capped so repeated previews never grow memory unbounded.
+        self._find_cache: OrderedDict[tuple[str, str], Optional[dict]] = OrderedDict()
+
+    _FIND_CACHE_MAX = 4096
+    # Page size for the artist walk — keeps peak memory at one page of JSON
+    # instead of a single 50k-item response buffered whole.
+    _ARTIST_PAGE_SIZE = 1000
 
     def _headers(self) -> dict:
         return {
@@ -48,12 +81,14 @@ class JellyfinClient:
         }
 
     def _get(self, path: str, params: Optional[dict] = None) -> dict:
-        resp = requests.get(f"{self.base_url}{path}", headers=self._headers(), params=params, timeout=30, verify=False)
+        resp = self._session.get(f"{self.base_url}{path}", headers=self._headers(), params=params, timeout=30, verify=False)
         resp.raise_for_status()
-        return resp.json()
+        # orjson decodes multi-MB library payloads roughly 2x faster than
+        # stdlib json, and full-library fetches are decoder-bound here.
+        return orjson.loads(resp.content)
 
     def _post(self, path: str, json_body: Optional[dict] = None, params: Optional[dict] = None) -> dict:
-        resp = requests.post(
+        resp = self._session.post(
             f"{self.base_url}{path}",
             headers=self._headers(),
             json=json_body,
@@ -62,7 +97,7 @@ class JellyfinClient:
             verify=False,
         )
         resp.raise_for_status()
-        return resp.json() if resp.text else {}
+        return orjson.loads(resp.content) if resp.content else {}
 
     def _fetch_first_user_id(self) -> Optional[str]:
         try:
@@ -78,27 +113,36 @@ class JellyfinClient:
         if self._artist_cache is not None and not refresh:
             return self._artist_cache
 
-        params = {
-            "IncludeItemTypes": "MusicArtist",
-            "Recursive": "true",
-            "Fields": "ChildCount,SortName",
-            "UserId": self.user_id,
-            "Limit": 50000,
-        }
-        data = self._get("/Items", params=params)
-        items = data.get("Items", [])
+        # Library is being re-read — stale track lookups must go too
+        self._find_cache.clear()
 
         artists: list[ArtistInfo] = []
-        for item in items:
-            artists.append(
-                ArtistInfo(
-                    title=item.get("Name", ""),
-                    item_id=item.get("Id", ""),
-                    album_count=item.get("ChildCount", 0),
-                    track_count=item.get("RunTimeTicks", 0),
-                    sort_name=item.get("SortName"),
+        start = 0
+        while True:
+            params = {
+                "IncludeItemTypes": "MusicArtist",
+                "Recursive": "true",
+                "Fields": "ChildCount,SortName",
+                "UserId": self.user_id,
+                "StartIndex": start,
+                "Limit": self._ARTIST_PAGE_SIZE,
+            }
+            data = self._get("/Items", params=params)
+            items = data.get("Items", [])
+            for item in items:
+                artists.append(
+                    ArtistInfo(
+                        title=item.get("Name", ""),
+                        item_id=item.get("Id", ""),
+                        album_count=item.get("ChildCount", 0),
+                        track_count=item.get("RunTimeTicks", 0),
+                        sort_name=item.get("SortName"),
+                    )
                 )
-            )
+            start += len(items)
+            total = data.get("TotalRecordCount")
+            if not items or (total is not None and start >= total):
+                break
 
         self._artist_cache = artists
         return artists
@@ -121,6 +165,10 @@ class JellyfinClient:
                     break
 
     def find_track(self, artist_name: str, track_name: str) -> Optional[dict]:
+        key = (artist_name.casefold(), track_name.casefold())
+        if key in self._find_cache:
+            return self._find_cache[key]
+
         params = {
             "SearchTerm": track_name,
             "IncludeItemTypes": "Audio",
@@ -138,11 +186,59 @@ class JellyfinClient:
             if self._fuzzy_match(item_artist, artist_name):
                 candidates.append(item)
 
-        if not candidates:
-            return None
-
-        candidates.sort(key=lambda i: i.get("RunTimeTicks", 0))
-        return candidates[0]
+        if candidates:
+            candidates.sort(key=lambda i: i.get("RunTimeTicks", 0))
+            result = candidates[0]
+        else:
+            result = None
+
+        self._find_cache[key] = result
+        if len(self._find_cache) > self._FIND_CACHE_MAX:
+            self._find_cache.popitem(last=False)
+        return result
+
+    def resolve_artist(self, artist_name: str) -> Optional[ArtistInfo]:
+        """Find the library artist whose name best matches, or None."""
+        artists = self.get_all_artists()
+        folded = artist_name.casefold()
+        for a in artists:
+            if a.title.casefold() == folded:
+                return a
+        match = process.extractOne(
+            artist_name.lower(),
+            [a.title.lower() for a in artists],
+            scorer=fuzz.token_sort_ratio,
+            score_cutoff=85,
+        )
+        return artists[match[2]] if match else None
+
+    def find_tracks_bulk(self, artist_name: str, titles: list[str]) -> dict[str, Optional[dict]]:
+        """Resolve many track titles for one artist with a single tracks fetch.
+
+        One /Items query pulls all of the artist's audio items; each requested
+        title is then matched locally — exact casefolded match first, fuzzy
+        fallback. Returns a mapping of title -> matched item (or None), so N
+        per-track searches collapse into one HTTP call per artist.
+        """
+        result: dict[str, Optional[dict]] = {t: None for t in titles}
+        artist = self.resolve_artist(artist_name)
+        if artist is None:
+            return result
+
+        by_name: dict[str, dict] = {}
+        for t in self.get_tracks_for_artist(artist.item_id):
+            by_name.setdefault(t.get("Name", "").casefold().strip(), t)
+        names = list(by_name)
+
+        for title in titles:
+            key = title.casefold().strip()
+            hit = by_name.get(key)
+            if hit is None and names:
+                match = process.extractOne(key, names, scorer=fuzz.token_sort_ratio, score_cutoff=85)
+                if match:
+                    hit = by_name[match[0]]
+            result[title] = hit
+        return result
 
     def create_playlist(self, name: str, item_ids: list[str]) -> str:
         params = {
@@ -215,6 +311,24 @@ class JellyfinClient:
         data = self._get("/Items", params=params)
         return data.get("Items", [])
 
+    def get_tracks_for_artist_ids(self, artist_ids: list[str]) -> list[dict]:
+        """Return all audio tracks for several artists in one query.
+
+        Jellyfin's ArtistIds filter accepts a comma-separated list, so the
+        caller pays one round-trip instead of one per artist; ArtistItems is
+        requested so results can be bucketed back per artist locally.
+        """
+        params = {
+            "IncludeItemTypes": "Audio",
+            "Recursive": "true",
+            "Fields": "Artists,ArtistItems,AlbumArtist,Album,RunTimeTicks,Path",
+            "ArtistIds": ",".join(artist_ids),
+            "UserId": self.user_id,
+            "Limit": 50000,
+        }
+        data = self._get("/Items", params=params)
+        return data.get("Items", [])
+
     def get_all_playlists(self) -> list[dict]:
         params = {
             "IncludeItemTypes": "Playlist",
@@ -227,7 +341,7 @@ class JellyfinClient:
         return data.get("Items", [])
 
     def delete_item(self, item_id: str) -> None:
-        resp = requests.delete(
+        resp = self._session.delete(
             f"{self.base_url}/Items/{item_id}",
             headers=self._headers(),
             timeout=30,
@@ -241,12 +355,35 @@ class JellyfinClient:
                 body = resp.text[:300]
             raise RuntimeError(f"HTTP {resp.status_code}: {body}")
 
+    def delete_items(self, item_ids: list[str]) -> None:
+        """Delete several items with one request.
+
+        /Items accepts a comma-separated Ids list, so a batch costs a single
+        round-trip instead of one DELETE per item.
+        """
+        if not item_ids:
+            return
+        resp = self._session.delete(
+            f"{self.base_url}/Items",
+            params={"Ids": ",".join(item_ids)},
+            headers=self._headers(),
+            timeout=30,
+            verify=False,
+        )
+        if not resp.ok:
+            body = ""
+            try:
+                body = resp.json().get("Message", resp.text[:300])
+            except Exception:
+                body = resp.text[:300]
+            raise RuntimeError(f"HTTP {resp.status_code}: {body}")
+
     def get_all_artists_raw(self) -> list[dict]:
         """Return raw artist dicts including ImageTags for artwork detection."""
         params = {
             "IncludeItemTypes": "MusicArtist",
             "Recursive": "true",
-            "Fields": "ChildCount,SortName,ImageTags,PrimaryImageAspectRatio",
+            "Fields": "ChildCount,SortName,ImageTags",
             "UserId": self.user_id,
             "Limit": 50000,
         }
@@ -272,7 +409,7 @@ class JellyfinClient:
             "ReplaceAllMetadata": "false",
             "ReplaceAllImages": "false",
         }
-        resp = requests.post(
+        resp = self._session.post(
             f"{self.base_url}/Items/{item_id}/Refresh",
             headers=self._headers(),
             params=params,
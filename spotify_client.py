@@ -4,13 +4,36 @@ Spotify API Client
 Handles interactions with the Spotify Web API for fetching artist top tracks.
 """
 
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+
 import spotipy
+from spotipy.cache_handler import CacheFileHandler, MemoryCacheHandler
 from spotipy.oauth2 import SpotifyClientCredentials
 
+from jellyfin_client import make_pooled_session
+
+# Same cache root the duplicate-scan edge cache uses
+_CACHE_DIR = Path.home() / ".cache" / "jellyfin-music-cleanup"
+
+
+def _token_cache_handler():
+    """File-backed token cache so restarts skip the auth round-trip;
+    falls back to the in-memory handler if the cache dir is unusable."""
+    try:
+        _CACHE_DIR.mkdir(parents=True, exist_ok=True)
+        return CacheFileHandler(cache_path=str(_CACHE_DIR / "spotify_token.json"))
+    except OSError:
+        return MemoryCacheHandler()
+
 
 class SpotifyClient:
     """Client for interacting with Spotify API"""
 
+    # Concurrent album/track fetches per get_top_tracks call — conservative
+    # so a deep catalog doesn't trip Spotify's rate limiting.
+    _FETCH_WORKERS = 8
+
     def __init__(self, client_id: str, client_secret: str):
         """
         Initialize Spotify client with credentials.
@@ -19,11 +42,27 @@ class SpotifyClient:
             client_id: Spotify API Client ID
             client_secret: Spotify API Client Secret
         """
+        # Disk-backed token cache: the bearer token survives restarts, so a
+        # relaunch within the token's lifetime skips the auth round-trip.
+        # Refresh stays lazy and no stray .cache file lands in the cwd.
         auth_manager = SpotifyClientCredentials(
             client_id=client_id,
-            client_secret=client_secret
+            client_secret=client_secret,
+            cache_handler=_token_cache_handler(),
         )
-        self.spotify = spotipy.Spotify(auth_manager=auth_manager)
+        # Shared pooled session so repeated API calls reuse TCP/TLS connections
+        self.spotify = spotipy.Spotify(
+            auth_manager=auth_manager,
+            requests_session=make_pooled_session(),
+        )
+
+        # Memoized top-track results, keyed on (normalized artist, limit).
+        # A per-instance dict (not lru_cache on the method) so the cache
+        # dies with the client and never pins self.
+        self._top_tracks_cache: dict[tuple[str, int], list[dict]] = {}
+        # Same deal for artist searches: get_top_tracks and get_artist_info
+        # both resolve the artist, so cache the lookup by lowercased name.
+        self._artist_cache: dict[str, dict | None] = {}
 
         # Test connection
         self.spotify.search(q="test", type="artist", limit=1)
@@ -38,6 +77,15 @@ class SpotifyClient:
         Returns:
             Artist dict if found, None otherwise
         """
+        cache_key = name.strip().lower()
+        if cache_key in self._artist_cache:
+            return self._artist_cache[cache_key]
+
+        result = self._search_artist_uncached(name)
+        self._artist_cache[cache_key] = result
+        return result
+
+    def _search_artist_uncached(self, name: str) -> dict | None:
         results = self.spotify.search(q=f'artist:"{name}"', type='artist', limit=5)
 
         artists = results.get('artists', {}).get('items', [])
@@ -70,6 +118,11 @@ class SpotifyClient:
         Returns:
             List of track dicts with 'name', 'album', 'popularity' keys, sorted by popularity
         """
+        cache_key = (artist_name.strip().lower(), limit)
+        cached = self._top_tracks_cache.get(cache_key)
+        if cached is not None:
+            return list(cached)
+
         artist = self.search_artist(artist_name)
 
         if not artist:
@@ -89,7 +142,9 @@ class SpotifyClient:
         except Exception:
             pass
 
-        # Get more tracks from albums to reach our limit
+        # Get more tracks from albums to reach our limit. The album-tracks
+        # and full-track fetches are independent HTTPS round-trips, so they
+        # fan out over a thread pool instead of stacking serially.
         if len(tracks) < limit:
             try:
                 albums = self.spotify.artist_albums(
@@ -97,31 +152,46 @@ class SpotifyClient:
                     album_type='album,single',
                     limit=20
                 )
+                album_ids = [a['id'] for a in albums.get('items', [])]
 
-                for album in albums.get('items', []):
-                    if len(tracks) >= limit:
-                        break
-
+                def _album_tracks(album_id: str) -> list[dict]:
                     try:
-                        album_tracks = self.spotify.album_tracks(album['id'])
-                        for track in album_tracks.get('items', []):
-                            if track['id'] in seen_track_ids:
-                                continue
-                            full_track = self.spotify.track(track['id'])
-                            if full_track:
-                                tracks.append(full_track)
-                                seen_track_ids.add(track['id'])
-                                if len(tracks) >= limit:
-                                    break
+                        return self.spotify.album_tracks(album_id).get('items', [])
                     except Exception:
-                        continue
+                        return []
+
+                with ThreadPoolExecutor(max_workers=self._FETCH_WORKERS) as ex:
+                    per_album = list(ex.map(_album_tracks, album_ids))
+
+                # Dedup on the main thread, then cap the candidate list at
+                # what's still needed before paying for full-track fetches.
+                candidate_ids = []
+                for album_tracks in per_album:
+                    for track in album_tracks:
+                        if track['id'] not in seen_track_ids:
+                            seen_track_ids.add(track['id'])
+                            candidate_ids.append(track['id'])
+                candidate_ids = candidate_ids[:limit - len(tracks)]
+
+                # The /tracks endpoint takes up to 50 ids per request, so the
+                # full-track hydration costs ceil(N/50) calls instead of N.
+                def _full_tracks(chunk: list[str]) -> list[dict]:
+                    try:
+                        return self.spotify.tracks(chunk).get('tracks', [])
+                    except Exception:
+                        return []
+
+                chunks = [candidate_ids[i:i + 50] for i in range(0, len(candidate_ids), 50)]
+                with ThreadPoolExecutor(max_workers=self._FETCH_WORKERS) as ex:
+                    for full in ex.map(_full_tracks, chunks):
+                        tracks.extend(t for t in full if t)
             except Exception:
                 pass
 
         tracks.sort(key=lambda t: t.get('popularity', 0), reverse=True)
         tracks = tracks[:limit]
 
-        return [
+        result = [
             {
                 'name': t['name'],
                 'album': t.get('album', {}).get('name', 'Unknown'),
@@ -132,6 +202,8 @@ class SpotifyClient:
             }
             for t in tracks
         ]
+        self._top_tracks_cache[cache_key] = result
+        return list(result)
 
     def get_artist_info(self, artist_name: str) -> dict | None:
         """
@@ -49,23 +49,50 @@ class SSHClient:
         return stdout.read().decode(), stderr.read().decode()
 
     def find_playlist_files(self, music_path: str) -> list[str]:
-        """Return sorted list of absolute .m3u/.m3u8 paths under music_path."""
+        """Return sorted list of absolute .m3u/.m3u8 paths under music_path.
+
+        NUL-separated output (no remote sort pipeline) so paths with
+        newlines survive; the small result list is sorted locally instead.
+        """
         music_path = music_path.rstrip("/")
         stdout, _ = self._run(
-            f"find {_q(music_path)} -type f \\( -iname '*.m3u' -o -iname '*.m3u8' \\) | sort"
+            f"find {_q(music_path)} -type f \\( -iname '*.m3u' -o -iname '*.m3u8' \\) -print0"
         )
-        return [l.strip() for l in stdout.splitlines() if l.strip()]
+        return sorted(p for p in stdout.split("\0") if p)
 
     def delete_files(self, paths: list[str]) -> dict[str, Optional[str]]:
         """
         Delete each path. Returns dict of path -> error message (or None on success).
         Uses rm -f so the app user needs read/write on those files.
+
+        All paths go through one remote xargs invocation — NUL-separated on
+        stdin — so the whole batch costs a single SSH round-trip instead of
+        one exec channel per file.
         """
-        results: dict[str, Optional[str]] = {}
-        for path in paths:
-            _, stderr = self._run(f"rm -f {_q(path)} && echo OK")
-            err = stderr.strip()
-            results[path] = err if err else None
+        if not paths:
+            return {}
+        # LC_ALL=C pins rm's message format so the stderr attribution
+        # below doesn't silently break on hosts with a non-English locale.
+        stdin, _, stderr = self._client.exec_command("LC_ALL=C xargs -0 rm -f --")
+        stdin.write(b"\0".join(p.encode() for p in paths))
+        stdin.channel.shutdown_write()
+        err_text = stderr.read().decode()
+
+        # rm reports failures as: rm: cannot remove 'path': reason
+        results: dict[str, Optional[str]] = {p: None for p in paths}
+        for line in err_text.splitlines():
+            line = line.strip()
+            if not line:
+                continue
+            matched = next((p for p in paths if f"'{p}'" in line or f"‘{p}’" in line), None)
+            if matched:
+                results[matched] = line
+            else:
+                # Can't attribute the error to one file — surface it on all
+                # paths still marked successful so nothing fails silently.
+                for p, v in results.items():
+                    if v is None:
+                        results[p] = line
         return results
 
     def whoami(self) -> str: